@@ -44,11 +44,11 @@ safer_function = '''def get_host_info():
 
     return hostinfo'''
 
-# Replace entire function
-pattern = r'def get_host_info\(\):.*?return hostinfo'
-content_new = re.sub(pattern, safer_function, content, flags=re.DOTALL)
+# Replace entire function (anchored to a top-level def, first match only)
+pattern = re.compile(r'^def get_host_info\(\):.*?return hostinfo', re.DOTALL | re.MULTILINE)
+content_new, count = pattern.subn(lambda _: safer_function, content, count=1)
 
-if content_new != content:
+if count and content_new != content:
     with open(utilities_path, 'w') as f:
         f.write(content_new)
     print('Patch applied successfully!')
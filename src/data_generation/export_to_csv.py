@@ -1,41 +1,82 @@
 """
 Convert gprMax output files to CSV
 """
+import io
+import os
 import sys
-import argparse
 import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 import h5py
 import numpy as np
 
 
-def load_gpr_output(output_file: str) -> dict:
+FIELD_COMPONENTS = ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz']
+
+# HDF5 open options for reading .out files: latest file format features and a
+# large chunk cache so whole traces are served from memory
+HDF5_READ_OPTIONS = {
+    'libver': 'latest',
+    'rdcc_nbytes': 64 * 1024 * 1024,
+    'rdcc_nslots': 1_000_003,
+    'rdcc_w0': 0.75
+}
+
+# Output buffer for CSV files (the default 8 KiB buffer forces many small writes)
+CSV_WRITE_BUFFER_SIZE = 4 << 20
+
+
+def load_gpr_output(
+    output_file: str,
+    rx_name: Optional[str] = None,
+    components: Optional[Iterable[str]] = None,
+    dtype: np.dtype = np.float32
+) -> dict:
     """
     Load gprMax output file
 
     Args:
         output_file: .out file path
+        rx_name: Receiver to load (all receivers if None)
+        components: Field components to load (all components if None)
+        dtype: dtype of the returned field arrays
 
     Returns:
         Data dictionary
     """
     data = {}
+    wanted = list(components) if components is not None else FIELD_COMPONENTS
 
-    with h5py.File(output_file, 'r') as f:
+    with h5py.File(output_file, 'r', **HDF5_READ_OPTIONS) as f:
         # Get receiver data
         rxs = f['rxs']
+        rx_available = list(rxs.keys())
+        rx_names = [rx_name] if rx_name is not None else rx_available
 
         # Load data for each receiver
-        for rx_name in rxs.keys():
-            rx = rxs[rx_name]
+        for name in rx_names:
+            if name not in rx_available:
+                continue
+            rx = rxs[name]
+            present = set(rx.keys())
+            names = [c for c in wanted if c in present]
             rx_data = {}
 
-            # Load each component
-            for component in ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz']:
-                if component in rx:
-                    rx_data[component] = np.array(rx[component])
+            # Read every component into one column of a shared (n_samples, n_components)
+            # buffer through the low-level API, skipping high-level Dataset objects
+            if names:
+                dataset_ids = [h5py.h5d.open(rx.id, c.encode()) for c in names]
+                n_samples = dataset_ids[0].shape[0]
+                buffer = np.empty((n_samples, len(names)), dtype=dtype)
+                memory_space = h5py.h5s.create_simple(buffer.shape)
+                for i, dataset_id in enumerate(dataset_ids):
+                    memory_space.select_hyperslab((0, i), (n_samples, 1))
+                    dataset_id.read(memory_space, dataset_id.get_space(), buffer)
+                rx_data = {component: buffer[:, i] for i, component in enumerate(names)}
 
-            data[rx_name] = rx_data
+            data[name] = rx_data
 
         # Metadata
         if 'dt' in f.attrs:
@@ -46,74 +87,184 @@ def load_gpr_output(output_file: str) -> dict:
     return data
 
 
-def export_to_csv(output_file: str, csv_file: str, rx_name: str = 'rx1'):
+def _csv_field(value: str) -> str:
+    """Quote a text field exactly as csv.writer would (only when needed)"""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator='').writerow([value])
+    return buf.getvalue()
+
+
+def _write_rows(f, table: np.ndarray, row_format: str, block_rows: int = 65536) -> None:
     """
-    Convert gprMax output to CSV file
+    Write a 2-D table as text rows, formatting each block with a single % operation
+
+    Args:
+        f: Binary file object
+        table: (n_rows, n_columns) array
+        row_format: printf-style format for one row (without newline)
+        block_rows: Rows formatted per block (bounds temporary memory)
+    """
+    row_format += '\n'
+    for start in range(0, table.shape[0], block_rows):
+        block = table[start:start + block_rows]
+        f.write((row_format * block.shape[0] % tuple(block.ravel().tolist())).encode('utf-8'))
+
+
+def _load_receiver(
+    output_file: str,
+    rx_name: str,
+    components: Optional[List[str]] = None
+) -> Optional[Tuple[np.ndarray, dict]]:
+    """
+    Load one receiver and build its time axis
 
     Args:
         output_file: .out file path
-        csv_file: Output CSV file path
         rx_name: Receiver name
+        components: Field components to load (all components if None)
+
+    Returns:
+        (time_ns, {component: signal}) in FIELD_COMPONENTS order, or None if nothing was found
     """
-    data = load_gpr_output(output_file)
+    data = load_gpr_output(output_file, rx_name=rx_name, components=components)
 
     if rx_name not in data:
         print(f"Error: Receiver {rx_name} not found")
-        available = [k for k in data.keys() if k.startswith('rx')]
+        with h5py.File(output_file, 'r') as f:
+            available = [k for k in f['rxs'].keys() if k.startswith('rx')]
         if available:
             print(f"Available receivers: {available}")
-        return False
+        return None
 
     rx_data = data[rx_name]
 
+    if not rx_data:
+        print(f"Error: No requested field components found in {rx_name}")
+        return None
+
     # Create time axis
     n_samples = len(rx_data[list(rx_data.keys())[0]])
 
     if 'dt' in data:
         dt = data['dt']
-        time = np.arange(n_samples) * dt
-        time_ns = time * 1e9  # ns
+        time_ns = np.arange(n_samples, dtype=np.float32) * np.float32(dt * 1e9)  # ns
     else:
-        time = np.arange(n_samples)
-        time_ns = time
+        time_ns = np.arange(n_samples, dtype=np.float32)
+
+    components = {c: rx_data[c] for c in FIELD_COMPONENTS if c in rx_data}
+
+    return time_ns, components
+
+
+def export_to_csv(
+    output_file: str,
+    csv_file: str,
+    rx_name: str = 'rx1',
+    components: Optional[List[str]] = None
+):
+    """
+    Convert gprMax output to CSV file
 
-    # Prepare CSV data
-    components = ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz']
-    available_components = [c for c in components if c in rx_data]
+    Args:
+        output_file: .out file path
+        csv_file: Output CSV file path
+        rx_name: Receiver name
+        components: Field components to export (all components if None)
+    """
+    receiver = _load_receiver(output_file, rx_name, components)
+    if receiver is None:
+        return False
+    time_ns, components = receiver
 
     # CSV output
     csv_path = Path(csv_file)
     csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(csv_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-
-        # Header
-        header = ['time_ns'] + available_components
-        writer.writerow(header)
+    # Stack columns into a single array so rows are formatted in one pass
+    header = ['time_ns'] + list(components)
+    table = np.column_stack([time_ns] + list(components.values()))
+    row_format = ','.join(['%.9g'] * len(header))
 
-        # Data rows
-        for i in range(n_samples):
-            row = [time_ns[i]]
-            for component in available_components:
-                row.append(rx_data[component][i])
-            writer.writerow(row)
+    with open(csv_path, 'wb', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+        f.write((','.join(header) + '\n').encode('ascii'))
+        _write_rows(f, table, row_format)
 
     print(f"Exported to {csv_path}")
-    print(f"  Rows: {n_samples}")
+    print(f"  Rows: {len(time_ns)}")
     print(f"  Columns: {header}")
 
     return True
 
 
-def export_batch(input_dir: str, output_dir: str, pattern: str = '*.out'):
+def export_to_parquet(
+    output_file: str,
+    parquet_file: str,
+    rx_name: str = 'rx1',
+    components: Optional[List[str]] = None
+):
     """
-    Batch convert all .out files in directory to CSV
+    Convert gprMax output to Parquet file (columnar, zstd-compressed)
+
+    Args:
+        output_file: .out file path
+        parquet_file: Output Parquet file path
+        rx_name: Receiver name
+        components: Field components to export (all components if None)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Error: pyarrow is required for Parquet export (pip install pyarrow)")
+        return False
+
+    receiver = _load_receiver(output_file, rx_name, components)
+    if receiver is None:
+        return False
+    time_ns, components = receiver
+
+    # Parquet output
+    parquet_path = Path(parquet_file)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+    columns = {'time_ns': time_ns}
+    columns.update({c: np.ascontiguousarray(signal) for c, signal in components.items()})
+    table = pa.table(columns)
+    pq.write_table(table, parquet_path, compression='zstd', use_dictionary=False)
+
+    print(f"Exported to {parquet_path}")
+    print(f"  Rows: {table.num_rows}")
+    print(f"  Columns: {table.column_names}")
+
+    return True
+
+
+EXPORTERS = {
+    'csv': export_to_csv,
+    'parquet': export_to_parquet
+}
+
+
+def export_batch(
+    input_dir: str,
+    output_dir: str,
+    pattern: str = '*.out',
+    rx_name: str = 'rx1',
+    num_workers: Optional[int] = None,
+    output_format: str = 'csv',
+    components: Optional[List[str]] = None
+):
+    """
+    Batch convert all .out files in directory to CSV (or Parquet)
 
     Args:
         input_dir: Input directory
         output_dir: Output directory
         pattern: File pattern
+        rx_name: Receiver name
+        num_workers: Number of parallel workers (defaults to CPU count if None)
+        output_format: Output format ('csv' or 'parquet')
+        components: Field components to export (all components if None)
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
@@ -132,15 +283,26 @@ def export_batch(input_dir: str, output_dir: str, pattern: str = '*.out'):
     print(f"Found {len(out_files)} .out files")
     print(f"Exporting to {output_path}...")
 
+    # Each worker opens its own HDF5 handle, so files convert independently
     success_count = 0
-    for out_file in out_files:
-        csv_file = output_path / f"{out_file.stem}.csv"
-
-        try:
-            if export_to_csv(str(out_file), str(csv_file)):
-                success_count += 1
-        except Exception as e:
-            print(f"Error processing {out_file}: {e}")
+    with ProcessPoolExecutor(max_workers=num_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                EXPORTERS[output_format],
+                str(out_file),
+                str(output_path / f"{out_file.stem}.{output_format}"),
+                rx_name,
+                components
+            ): out_file
+            for out_file in out_files
+        }
+
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    success_count += 1
+            except Exception as e:
+                print(f"Error processing {futures[future]}: {e}")
 
     print(f"\nExport completed: {success_count}/{len(out_files)} files")
 
@@ -167,15 +329,13 @@ def export_sequence_to_single_csv(
     total_rows = 0
     file_count = 0
 
-    with open(csv_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-
+    with open(csv_path, 'wb', buffering=CSV_WRITE_BUFFER_SIZE) as f:
         # Header
-        writer.writerow(['sequence_id', 'file', 'time_ns', component])
+        f.write((','.join(['sequence_id', 'file', 'time_ns', component]) + '\n').encode('ascii'))
 
         # Write data for each file
         for i, out_file in enumerate(sorted(output_files)):
-            data = load_gpr_output(out_file)
+            data = load_gpr_output(out_file, rx_name=rx_name, components=[component])
 
             if rx_name not in data or component not in data[rx_name]:
                 print(f"Warning: {component} not found in {out_file}")
@@ -187,15 +347,15 @@ def export_sequence_to_single_csv(
             n_samples = len(signal)
             if 'dt' in data:
                 dt = data['dt']
-                time_ns = np.arange(n_samples) * dt * 1e9
+                time_ns = np.arange(n_samples, dtype=np.float32) * np.float32(dt * 1e9)
             else:
-                time_ns = np.arange(n_samples)
+                time_ns = np.arange(n_samples, dtype=np.float32)
 
-            # Write data rows
-            filename = Path(out_file).name
-            for j in range(n_samples):
-                writer.writerow([i, filename, time_ns[j], signal[j]])
-                total_rows += 1
+            # Write data rows (constant sequence_id/file columns are baked into the format)
+            filename = _csv_field(Path(out_file).name).replace('%', '%%')
+            table = np.column_stack([time_ns, signal])
+            _write_rows(f, table, f'{i},{filename},%.9g,%.9g')
+            total_rows += n_samples
 
             file_count += 1
 
@@ -212,7 +372,7 @@ def export_sequence_to_single_csv(
 
 def main():
     """Main execution"""
-    parser = argparse.ArgumentParser(description='Export gprMax output to CSV')
+    parser = argparse.ArgumentParser(description='Export gprMax output to CSV or Parquet')
     parser.add_argument(
         'input',
         type=str,
@@ -222,7 +382,7 @@ def main():
         '--output',
         type=str,
         required=True,
-        help='Output CSV file or directory'
+        help='Output CSV/Parquet file or directory'
     )
     parser.add_argument(
         '--mode',
@@ -237,6 +397,14 @@ def main():
         default='Ez',
         help='Field component for sequence mode (default: Ez)'
     )
+    parser.add_argument(
+        '--components',
+        type=str,
+        nargs='+',
+        choices=FIELD_COMPONENTS,
+        default=None,
+        help='Field components for single/batch mode (default: all)'
+    )
     parser.add_argument(
         '--rx',
         type=str,
@@ -249,6 +417,19 @@ def main():
         default='*.out',
         help='File pattern for batch mode (default: *.out)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parallel workers for batch mode (default: CPU count)'
+    )
+    parser.add_argument(
+        '--format',
+        type=str,
+        default='csv',
+        choices=['csv', 'parquet'],
+        help='Output format for single/batch mode (default: csv)'
+    )
 
     args = parser.parse_args()
 
@@ -261,19 +442,36 @@ def main():
     # Mode-specific processing
     if args.mode == 'single':
         if input_path.is_file():
-            export_to_csv(str(input_path), args.output, rx_name=args.rx)
+            EXPORTERS[args.format](
+                str(input_path),
+                args.output,
+                rx_name=args.rx,
+                components=args.components
+            )
         else:
             print("Error: single mode requires a .out file")
             sys.exit(1)
 
     elif args.mode == 'batch':
         if input_path.is_dir():
-            export_batch(str(input_path), args.output, pattern=args.pattern)
+            export_batch(
+                str(input_path),
+                args.output,
+                pattern=args.pattern,
+                rx_name=args.rx,
+                num_workers=args.workers,
+                output_format=args.format,
+                components=args.components
+            )
         else:
             print("Error: batch mode requires a directory")
             sys.exit(1)
 
     elif args.mode == 'sequence':
+        if args.format != 'csv':
+            print("Error: sequence mode only supports CSV output")
+            sys.exit(1)
+
         if input_path.is_dir():
             out_files = sorted(input_path.glob(args.pattern))
             if not out_files:
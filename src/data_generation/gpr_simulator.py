@@ -2,12 +2,107 @@
 GPR Simulation: Time-series data generation for road subsurface void evolution
 """
 import os
+import json
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from pathlib import Path
 import h5py
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional, NamedTuple
+from tqdm import tqdm
 import yaml
 
+# Optional: Numba compiles a fused normalization kernel for large arrays
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Prefer the libyaml C emitter; fall back to the pure-Python one if unavailable
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# HDF5 open options for reading .out files: the in-memory core driver reads the
+# (small) file once, plus latest file format features and a large chunk cache
+HDF5_READ_OPTIONS = {
+    'driver': 'core',
+    'backing_store': False,
+    'libver': 'latest',
+    'rdcc_nbytes': 64 * 1024 * 1024,
+    'rdcc_nslots': 1_000_003,
+    'rdcc_w0': 0.75
+}
+
+
+
+class VoidParams(NamedTuple):
+    """Void parameters for one stage (absolute coordinates)"""
+    center_x: float
+    center_y: float
+    center_z: float
+    size_x: float
+    size_y: float
+    size_z: float
+    stage: int
+    progress: float
+
+
+# Per-stage void parameters as a structured array record (same fields as VoidParams)
+VOID_PARAMS_DTYPE = np.dtype([
+    ('center_x', np.float64),
+    ('center_y', np.float64),
+    ('center_z', np.float64),
+    ('size_x', np.float64),
+    ('size_y', np.float64),
+    ('size_z', np.float64),
+    ('stage', np.int64),
+    ('progress', np.float64)
+])
+
+# Order in which initial void parameters are drawn
+INITIAL_VOID_PARAMETER_NAMES = [
+    'x_position_ratio',
+    'y_position_ratio',
+    'depth_ratio',
+    'size_x_ratio',
+    'size_y_ratio',
+    'size_z_ratio',
+    'max_growth_rate',
+    'max_upward_movement_ratio'
+]
+
+
+# Static sections of the gprMax B-scan input file (rendered once per simulator)
+GPR_INPUT_HEADER_TEMPLATE = """#domain: {domain_x} {domain_y} {z_domain_top}
+#dx_dy_dz: {dx} {dx} {dx}
+#time_window: {time_window}e-9
+
+#material: {materials[air]} 0 1 0 air
+#material: {materials[surface_asphalt]} 0.01 1 0 surface_asphalt
+#material: {materials[base_asphalt]} 0.01 1 0 base_asphalt
+#material: {materials[upper_subbase]} 0.02 1 0 upper_subbase
+#material: {materials[lower_subbase]} 0.02 1 0 lower_subbase
+#material: {materials[subgrade]} 0.05 1 0 subgrade
+#material: {materials[void]} 0 1 0 void
+
+#box: 0 0 {z_domain_bottom} {domain_x} {domain_y} {z_air_top} air
+#box: 0 0 {z_surface_asphalt_top} {domain_x} {domain_y} {z_base_asphalt_top} surface_asphalt
+#box: 0 0 {z_base_asphalt_top} {domain_x} {domain_y} {z_upper_subbase_top} base_asphalt
+#box: 0 0 {z_upper_subbase_top} {domain_x} {domain_y} {z_lower_subbase_top} upper_subbase
+#box: 0 0 {z_lower_subbase_top} {domain_x} {domain_y} {z_subgrade_top} lower_subbase
+#box: 0 0 {z_subgrade_top} {domain_x} {domain_y} {z_domain_top} subgrade
+
+"""
+
+GPR_INPUT_FOOTER_TEMPLATE = """
+#waveform: ricker 1 {frequency}e6 my_ricker
+#hertzian_dipole: z {tx_start_x} {tx_y} {antenna_z} my_ricker
+#rx: {tx_start_x} {tx_y} {antenna_z}
+
+#src_steps: {step_size} 0 0
+#rx_steps: {step_size} 0 0
+
+#geometry_view: 0 0 0 {domain_x} {domain_y} {domain_z} {dx} {dx} {dx} geometry_seq_%04d_stage_%02d f
+"""
+
 
 class VoidEvolutionSimulator:
     """Class to simulate void growth and upward movement"""
@@ -62,31 +157,148 @@ class VoidEvolutionSimulator:
                         self.lower_subbase_thickness +
                         self.subgrade_thickness)
 
-    def generate_initial_void_parameters(self, sequence_seed: int = None) -> Dict:
+        # Pre-render the parts of the .in file that do not depend on the void
+        self._build_input_templates()
+
+        # Initial void parameters already drawn, keyed by sequence seed
+        self._initial_params_cache: Dict[int, Tuple[float, ...]] = {}
+
+        # Bounds of the initial void parameters (INITIAL_VOID_PARAMETER_NAMES order)
+        ranges = [
+            self.void_initial_x_position_range,
+            self.void_initial_y_position_range,
+            self.void_initial_depth_ratio_range,
+            self.void_initial_size_x_ratio_range,
+            self.void_initial_size_y_ratio_range,
+            self.void_initial_size_z_ratio_range,
+            self.void_growth_rate_range,
+            self.void_upward_movement_ratio_range
+        ]
+        self._initial_params_low = np.array([r[0] for r in ranges], dtype=float)
+        self._initial_params_high = np.array([r[1] for r in ranges], dtype=float)
+
+        # Generator for unseeded draws (seeded sequences get their own generator)
+        self._rng = np.random.default_rng()
+
+    def _build_input_templates(self) -> None:
+        """Render the stage-independent header and footer of the .in file"""
+        # Domain size (from config)
+        domain_x = self.domain_x
+        domain_y = self.domain_y
+        domain_z = self.domain_z
+
+        # Discretization (dx)
+        dx = self.spatial_resolution
+
+        # Calculate layer positions
+        # z=0 is road surface (antenna position), positive z goes downward into road
+        z_road_surface = 0.0  # Road surface level (antenna position)
+
+        # Air layer extends downward (negative direction from road surface)
+        z_air_bottom = z_road_surface - self.air_thickness
+
+        # Road layers going downward from surface (positive z direction)
+        z_surface_asphalt_bottom = z_road_surface + self.surface_asphalt_thickness
+        z_base_asphalt_bottom = z_surface_asphalt_bottom + self.base_asphalt_thickness
+        z_upper_subbase_bottom = z_base_asphalt_bottom + self.upper_subbase_thickness
+        z_lower_subbase_bottom = z_upper_subbase_bottom + self.lower_subbase_thickness
+        z_subgrade_bottom = z_lower_subbase_bottom + self.subgrade_thickness  # Domain bottom
+
+        # Calculate B-scan parameters
+        # Convert ratio to absolute position
+        tx_start_x = self.scan_start_x_ratio * domain_x
+        tx_end_x = self.scan_end_x_ratio * domain_x
+        tx_y = domain_y / 2
+        tx_z = 0.0  # At road surface level
+
+        # Calculate step size for B-scan
+        scan_length = tx_end_x - tx_start_x
+        step_size = scan_length / (self.num_traces - 1) if self.num_traces > 1 else 0
+
+        # Domain coordinates (gprMax requires positive values starting from 0)
+        # We need to shift everything so the air layer bottom is at z=0
+        z_offset = abs(z_air_bottom)  # Offset to make air bottom at z=0
+
+        # Apply offset to all z coordinates
+        z_domain_bottom = z_offset + z_air_bottom  # Should be 0.0
+        z_air_top = z_offset + z_road_surface  # Road surface after offset
+        z_surface_asphalt_top = z_air_top
+        z_base_asphalt_top = z_offset + z_surface_asphalt_bottom
+        z_upper_subbase_top = z_offset + z_base_asphalt_bottom
+        z_lower_subbase_top = z_offset + z_upper_subbase_bottom
+        z_subgrade_top = z_offset + z_lower_subbase_bottom
+        z_domain_top = z_offset + z_subgrade_bottom  # Domain top
+
+        # Antenna at road surface (z=0 in logical coordinates, z_air_top after offset)
+        antenna_z = z_air_top
+
+        self._z_offset = z_offset
+        static_header = GPR_INPUT_HEADER_TEMPLATE.format(
+            domain_x=domain_x,
+            domain_y=domain_y,
+            dx=dx,
+            time_window=self.time_window,
+            materials=self.materials,
+            z_domain_bottom=z_domain_bottom,
+            z_air_top=z_air_top,
+            z_surface_asphalt_top=z_surface_asphalt_top,
+            z_base_asphalt_top=z_base_asphalt_top,
+            z_upper_subbase_top=z_upper_subbase_top,
+            z_lower_subbase_top=z_lower_subbase_top,
+            z_subgrade_top=z_subgrade_top,
+            z_domain_top=z_domain_top
+        )
+        # Leaves %04d/%02d (sequence ID, stage) in the geometry view name for per-file formatting
+        static_footer = GPR_INPUT_FOOTER_TEMPLATE.format(
+            domain_x=domain_x,
+            domain_y=domain_y,
+            domain_z=domain_z,
+            dx=dx,
+            frequency=self.frequency,
+            tx_start_x=tx_start_x,
+            tx_y=tx_y,
+            antenna_z=antenna_z,
+            step_size=step_size
+        )
+
+        # Only the title (stage), void box (x0 y0 z0 x1 y1 z1) and geometry view name
+        # (sequence ID, stage) vary; the header between them is written as-is
+        self._in_title_template = b"#title: Road void evolution stage %d (B-scan)\n"
+        self._in_header = static_header.encode('ascii')
+        self._in_suffix_template = "#box: %s %s %s %s %s %s void\n" + static_footer
+
+    def generate_initial_void_parameters(
+        self,
+        sequence_seed: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> Dict:
         """
         Generate initial void parameters for a sequence
 
         Args:
-            sequence_seed: Seed to fix initial values per sequence
+            sequence_seed: Seed to fix initial values per sequence (ignored if rng is given)
+            rng: Random generator dedicated to this sequence
 
         Returns:
             Dictionary of initial void parameters (all ratios 0-1)
         """
-        if sequence_seed is not None:
-            np.random.seed(sequence_seed)
-
-        return {
-            'x_position_ratio': np.random.uniform(*self.void_initial_x_position_range),
-            'y_position_ratio': np.random.uniform(*self.void_initial_y_position_range),
-            'depth_ratio': np.random.uniform(*self.void_initial_depth_ratio_range),
-            'size_x_ratio': np.random.uniform(*self.void_initial_size_x_ratio_range),
-            'size_y_ratio': np.random.uniform(*self.void_initial_size_y_ratio_range),
-            'size_z_ratio': np.random.uniform(*self.void_initial_size_z_ratio_range),
-            'max_growth_rate': np.random.uniform(*self.void_growth_rate_range),
-            'max_upward_movement_ratio': np.random.uniform(*self.void_upward_movement_ratio_range)
-        }
-
-    def generate_void_parameters(self, stage: int, total_stages: int, initial_params: Dict) -> Dict:
+        # Seeded draws are deterministic, so reuse them instead of touching the RNG again
+        use_cache = rng is None and sequence_seed is not None
+        if use_cache and sequence_seed in self._initial_params_cache:
+            return dict(zip(INITIAL_VOID_PARAMETER_NAMES, self._initial_params_cache[sequence_seed]))
+
+        if rng is None:
+            rng = np.random.default_rng(sequence_seed) if sequence_seed is not None else self._rng
+
+        # Draw all initial parameters in a single vectorized call
+        values = rng.uniform(self._initial_params_low, self._initial_params_high).tolist()
+
+        if use_cache:
+            self._initial_params_cache[sequence_seed] = tuple(values)
+
+        return dict(zip(INITIAL_VOID_PARAMETER_NAMES, values))
+
+    def generate_void_parameters(self, stage: int, total_stages: int, initial_params: Dict) -> VoidParams:
         """
         Generate void time-evolution parameters for a specific stage
 
@@ -96,7 +308,7 @@ class VoidEvolutionSimulator:
             initial_params: Initial void parameters from generate_initial_void_parameters()
 
         Returns:
-            Void parameter dictionary with absolute coordinates
+            Void parameters with absolute coordinates
         """
         # Progress (0.0 ~ 1.0)
         progress = stage / (total_stages - 1) if total_stages > 1 else 0
@@ -142,122 +354,165 @@ class VoidEvolutionSimulator:
         elif center_z + size_z > road_depth:
             center_z = road_depth - size_z
 
-        return {
-            'center_x': center_x,
-            'center_y': center_y,
-            'center_z': center_z,
-            'size_x': size_x,
-            'size_y': size_y,
-            'size_z': size_z,
-            'stage': stage,
-            'progress': progress
-        }
-
-    def create_gpr_input_file(self, void_params: Dict, filename: str, sequence_id: int = 0) -> str:
+        return VoidParams(
+            center_x=float(center_x),
+            center_y=float(center_y),
+            center_z=float(center_z),
+            size_x=float(size_x),
+            size_y=float(size_y),
+            size_z=float(size_z),
+            stage=stage,
+            progress=float(progress)
+        )
+
+    def generate_void_parameters_batch(self, seq_id: int, total_stages: int) -> np.ndarray:
         """
-        Generate gprMax input file (.in) for B-scan
+        Generate void parameters for all stages of a sequence as a structured array
+
+        Vectorized equivalent of calling generate_void_parameters() for every stage.
 
         Args:
-            void_params: Void parameters
-            filename: Output filename
-            sequence_id: Sequence ID for geometry view naming
+            seq_id: Sequence ID (also used as the sequence seed)
+            total_stages: Total number of stages
 
         Returns:
-            Generated file path
+            Structured array (VOID_PARAMS_DTYPE) with absolute coordinates, one record per stage
         """
-        filepath = self.output_dir / filename
+        initial_params = self.generate_initial_void_parameters(sequence_seed=seq_id)
 
-        # Domain size (from config)
-        domain_x = self.domain_x
-        domain_y = self.domain_y
-        domain_z = self.domain_z
+        # Progress (0.0 ~ 1.0) for every stage
+        stages = np.arange(total_stages)
+        if total_stages > 1:
+            progress = stages / (total_stages - 1)
+        else:
+            progress = np.zeros(total_stages)
 
-        # Discretization (dx)
-        dx = self.spatial_resolution
+        # Calculate road depth (excluding air layer)
+        road_depth = self.domain_z - self.air_thickness
 
-        # Calculate layer positions
-        # z=0 is road surface (antenna position), positive z goes downward into road
-        z_road_surface = 0.0  # Road surface level (antenna position)
+        # Growth rate (simulate non-linear growth) and upward movement ratio
+        growth_rate = 1.0 + progress ** 1.5 * (initial_params['max_growth_rate'] - 1.0)
+        upward_movement_ratio = progress * initial_params['max_upward_movement_ratio']
 
-        # Air layer extends downward (negative direction from road surface)
-        z_air_bottom = z_road_surface - self.air_thickness
+        # Convert ratios to absolute coordinates
+        center_x = np.full(total_stages, initial_params['x_position_ratio'] * self.domain_x)
+        center_y = np.full(total_stages, initial_params['y_position_ratio'] * self.domain_y)
+        initial_depth = initial_params['depth_ratio'] * road_depth
+        center_z = initial_depth - upward_movement_ratio * initial_depth  # Rising toward surface
 
-        # Road layers going downward from surface (positive z direction)
-        z_surface_asphalt_bottom = z_road_surface + self.surface_asphalt_thickness
-        z_base_asphalt_bottom = z_surface_asphalt_bottom + self.base_asphalt_thickness
-        z_upper_subbase_bottom = z_base_asphalt_bottom + self.upper_subbase_thickness
-        z_lower_subbase_bottom = z_upper_subbase_bottom + self.lower_subbase_thickness
-        z_subgrade_bottom = z_lower_subbase_bottom + self.subgrade_thickness  # Domain bottom
+        size_x = initial_params['size_x_ratio'] * self.domain_x * growth_rate
+        size_y = initial_params['size_y_ratio'] * self.domain_y * growth_rate
+        size_z = initial_params['size_z_ratio'] * road_depth * growth_rate ** 0.8
 
-        # Calculate B-scan parameters
-        # Convert ratio to absolute position
-        tx_start_x = self.scan_start_x_ratio * domain_x
-        tx_end_x = self.scan_end_x_ratio * domain_x
-        tx_y = domain_y / 2
-        tx_z = 0.0  # At road surface level
+        # Ensure void stays within domain bounds
+        half_size_x = size_x / 2
+        half_size_y = size_y / 2
+        center_x = np.where(center_x - half_size_x < 0, half_size_x,
+                            np.where(center_x + half_size_x > self.domain_x,
+                                     self.domain_x - half_size_x, center_x))
+        center_y = np.where(center_y - half_size_y < 0, half_size_y,
+                            np.where(center_y + half_size_y > self.domain_y,
+                                     self.domain_y - half_size_y, center_y))
 
-        # Calculate step size for B-scan
-        scan_length = tx_end_x - tx_start_x
-        step_size = scan_length / (self.num_traces - 1) if self.num_traces > 1 else 0
+        # Ensure void stays within road depth (doesn't extend above surface or below bottom)
+        center_z = np.where(center_z < 0, 0.0,
+                            np.where(center_z + size_z > road_depth,
+                                     road_depth - size_z, center_z))
+
+        params = np.empty(total_stages, dtype=VOID_PARAMS_DTYPE)
+        params['center_x'] = center_x
+        params['center_y'] = center_y
+        params['center_z'] = center_z
+        params['size_x'] = size_x
+        params['size_y'] = size_y
+        params['size_z'] = size_z
+        params['stage'] = stages
+        params['progress'] = progress
+
+        return params
+
+    def generate_sequence_parameters(self, seq_id: int, total_stages: int) -> List[VoidParams]:
+        """
+        Generate void parameters for all stages of a sequence at once
 
-        # Domain coordinates (gprMax requires positive values starting from 0)
-        # We need to shift everything so the air layer bottom is at z=0
-        z_offset = abs(z_air_bottom)  # Offset to make air bottom at z=0
+        Args:
+            seq_id: Sequence ID (also used as the sequence seed)
+            total_stages: Total number of stages
 
-        # Apply offset to all z coordinates
-        z_domain_bottom = z_offset + z_air_bottom  # Should be 0.0
-        z_air_top = z_offset + z_road_surface  # Road surface after offset
-        z_surface_asphalt_top = z_air_top
-        z_base_asphalt_top = z_offset + z_surface_asphalt_bottom
-        z_upper_subbase_top = z_offset + z_base_asphalt_bottom
-        z_lower_subbase_top = z_offset + z_upper_subbase_bottom
-        z_subgrade_top = z_offset + z_lower_subbase_bottom
-        z_domain_top = z_offset + z_subgrade_bottom  # Domain top
+        Returns:
+            List of void parameters with absolute coordinates, one per stage
+        """
+        params = self.generate_void_parameters_batch(seq_id, total_stages)
+        return list(map(VoidParams._make, params.tolist()))
 
-        # Antenna at road surface (z=0 in logical coordinates, z_air_top after offset)
-        antenna_z = z_air_top
+    def create_gpr_input_file(self, void_params: VoidParams, filename: str, sequence_id: int = 0) -> str:
+        """
+        Generate gprMax input file (.in) for B-scan
 
-        content = f"""#title: Road void evolution stage {void_params['stage']} (B-scan)
-#domain: {domain_x} {domain_y} {z_domain_top}
-#dx_dy_dz: {dx} {dx} {dx}
-#time_window: {self.time_window}e-9
+        Args:
+            void_params: Void parameters
+            filename: Output filename
+            sequence_id: Sequence ID for geometry view naming
 
-#material: {self.materials['air']} 0 1 0 air
-#material: {self.materials['surface_asphalt']} 0.01 1 0 surface_asphalt
-#material: {self.materials['base_asphalt']} 0.01 1 0 base_asphalt
-#material: {self.materials['upper_subbase']} 0.02 1 0 upper_subbase
-#material: {self.materials['lower_subbase']} 0.02 1 0 lower_subbase
-#material: {self.materials['subgrade']} 0.05 1 0 subgrade
-#material: {self.materials['void']} 0 1 0 void
+        Returns:
+            Generated file path
+        """
+        filepath = self.output_dir / filename
 
-#box: 0 0 {z_domain_bottom} {domain_x} {domain_y} {z_air_top} air
-#box: 0 0 {z_surface_asphalt_top} {domain_x} {domain_y} {z_base_asphalt_top} surface_asphalt
-#box: 0 0 {z_base_asphalt_top} {domain_x} {domain_y} {z_upper_subbase_top} base_asphalt
-#box: 0 0 {z_upper_subbase_top} {domain_x} {domain_y} {z_lower_subbase_top} upper_subbase
-#box: 0 0 {z_lower_subbase_top} {domain_x} {domain_y} {z_subgrade_top} lower_subbase
-#box: 0 0 {z_subgrade_top} {domain_x} {domain_y} {z_domain_top} subgrade
+        title = self._in_title_template % void_params.stage
 
-#box: {void_params['center_x'] - void_params['size_x']/2} {void_params['center_y'] - void_params['size_y']/2} {z_offset + void_params['center_z']} {void_params['center_x'] + void_params['size_x']/2} {void_params['center_y'] + void_params['size_y']/2} {z_offset + void_params['center_z'] + void_params['size_z']} void
+        # Void box corners (z shifted so the air layer bottom is at z=0)
+        suffix = self._in_suffix_template % (
+            void_params.center_x - void_params.size_x/2,
+            void_params.center_y - void_params.size_y/2,
+            self._z_offset + void_params.center_z,
+            void_params.center_x + void_params.size_x/2,
+            void_params.center_y + void_params.size_y/2,
+            self._z_offset + void_params.center_z + void_params.size_z,
+            sequence_id,
+            void_params.stage
+        )
 
-#waveform: ricker 1 {self.frequency}e6 my_ricker
-#hertzian_dipole: z {tx_start_x} {tx_y} {antenna_z} my_ricker
-#rx: {tx_start_x} {tx_y} {antenna_z}
+        _write_bytes(filepath, b''.join((title, self._in_header, suffix.encode('ascii'))))
 
-#src_steps: {step_size} 0 0
-#rx_steps: {step_size} 0 0
+        return str(filepath)
 
-#geometry_view: 0 0 0 {domain_x} {domain_y} {domain_z} {dx} {dx} {dx} geometry_seq_{sequence_id:04d}_stage_{void_params['stage']:02d} f
-"""
+    def generate_sequence(self, seq_id: int, stages_per_sequence: int) -> List[Dict]:
+        """
+        Generate all stages of a single sequence
 
-        with open(filepath, 'w') as f:
-            f.write(content)
+        Args:
+            seq_id: Sequence ID (also used as the sequence seed)
+            stages_per_sequence: Number of stages per sequence
 
-        return str(filepath)
+        Returns:
+            List of metadata dictionaries, one per stage
+        """
+        sequence_metadata = []
+
+        # Void parameters for every stage, computed in one vectorized pass
+        sequence_params = self.generate_sequence_parameters(seq_id, stages_per_sequence)
+
+        for stage, void_params in enumerate(sequence_params):
+            # Generate gprMax input file
+            input_filename = f"seq_{seq_id:04d}_stage_{stage:02d}.in"
+            input_file = self.create_gpr_input_file(void_params, input_filename, sequence_id=seq_id)
+
+            sequence_metadata.append({
+                'sequence_id': seq_id,
+                'stage': stage,
+                'input_file': input_filename,
+                'void_params': void_params._asdict()
+            })
+
+        return sequence_metadata
 
     def generate_time_series_dataset(
         self,
         num_sequences: int,
-        stages_per_sequence: int
+        stages_per_sequence: int,
+        num_workers: Optional[int] = None,
+        metadata_format: str = 'yaml'
     ) -> None:
         """
         Generate time-series dataset
@@ -265,48 +520,106 @@ class VoidEvolutionSimulator:
         Args:
             num_sequences: Number of sequences to generate
             stages_per_sequence: Number of stages per sequence
+            num_workers: Number of parallel workers (defaults to CPU count if None)
+            metadata_format: 'yaml' (metadata.yaml) or 'jsonl' (metadata.jsonl, one record per line)
         """
         print(f"Generating {num_sequences} time series sequences...")
         print(f"Each sequence has {stages_per_sequence} stages")
 
+        num_workers = min(num_workers or os.cpu_count(), num_sequences)
+        seq_ids = range(num_sequences)
+
         metadata = []
+        with tqdm(total=num_sequences * stages_per_sequence, desc="Generating input files") as progress:
+            if num_workers > 1:
+                # Each worker builds its simulator once; sequences are handed out in chunks
+                chunksize = max(1, num_sequences // (num_workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    initializer=_init_worker,
+                    initargs=(self.config,)
+                ) as executor:
+                    results = executor.map(
+                        _generate_sequence,
+                        seq_ids,
+                        [stages_per_sequence] * num_sequences,
+                        chunksize=chunksize
+                    )
+                    for sequence_metadata in results:
+                        metadata.extend(sequence_metadata)
+                        progress.update(len(sequence_metadata))
+            else:
+                for seq_id in seq_ids:
+                    sequence_metadata = self.generate_sequence(seq_id, stages_per_sequence)
+                    metadata.extend(sequence_metadata)
+                    progress.update(len(sequence_metadata))
 
-        for seq_id in range(num_sequences):
-            print(f"\nSequence {seq_id + 1}/{num_sequences}")
-            sequence_metadata = []
+        # Save metadata
+        if metadata_format == 'jsonl':
+            metadata_file = self.output_dir / 'metadata.jsonl'
+            with open(metadata_file, 'w') as f:
+                f.writelines(json.dumps(record, separators=(',', ':')) + '\n' for record in metadata)
+        else:
+            metadata_file = self.output_dir / 'metadata.yaml'
+            with open(metadata_file, 'w') as f:
+                yaml.dump(metadata, f, Dumper=YAML_DUMPER, default_flow_style=False)
 
-            # Generate initial void parameters for this sequence
-            initial_params = self.generate_initial_void_parameters(sequence_seed=seq_id)
+        print(f"\nMetadata saved to {metadata_file}")
+        print(f"Total input files generated: {len(metadata)}")
 
-            for stage in range(stages_per_sequence):
-                # Use consistent initial parameters per sequence
-                void_params = self.generate_void_parameters(stage, stages_per_sequence, initial_params)
+        return metadata
 
-                # Generate gprMax input file
-                input_filename = f"seq_{seq_id:04d}_stage_{stage:02d}.in"
-                input_file = self.create_gpr_input_file(void_params, input_filename, sequence_id=seq_id)
 
-                sequence_metadata.append({
-                    'sequence_id': seq_id,
-                    'stage': stage,
-                    'input_file': input_filename,
-                    'void_params': void_params
-                })
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write bytes with raw OS calls, skipping Python's file object layers"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
-                print(f"  Stage {stage}: depth={void_params['center_z']:.2f}m, "
-                      f"size_x={void_params['size_x']:.2f}m")
 
-            metadata.extend(sequence_metadata)
+# Simulator owned by each sequence generation worker process
+_worker_simulator = None
 
-        # Save metadata
-        metadata_file = self.output_dir / 'metadata.yaml'
-        with open(metadata_file, 'w') as f:
-            yaml.dump(metadata, f, default_flow_style=False)
 
-        print(f"\nMetadata saved to {metadata_file}")
-        print(f"Total input files generated: {len(metadata)}")
+def _init_worker(config: Dict) -> None:
+    """Build the simulator once per worker process"""
+    global _worker_simulator
+    _worker_simulator = VoidEvolutionSimulator(config)
 
-        return metadata
+
+def _generate_sequence(seq_id: int, stages_per_sequence: int) -> List[Dict]:
+    """Worker for parallel sequence generation"""
+    return _worker_simulator.generate_sequence(seq_id, stages_per_sequence)
+
+
+# Smallest array normalized with the Numba kernel (below this JIT dispatch isn't worth it)
+NUMBA_NORMALIZE_MIN_SIZE = 1 << 20
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_kernel(x, out):
+        """Write (x - mean) / std into out: two parallel reductions and one write pass"""
+        n = x.size
+        total = 0.0
+        for i in prange(n):
+            total += x[i]
+        mean = total / n
+
+        sq_dev = 0.0
+        for i in prange(n):
+            d = x[i] - mean
+            sq_dev += d * d
+        std = np.sqrt(sq_dev / n)
+
+        scale = 1.0 / std if std > 0 else 1.0
+        for i in prange(n):
+            out[i] = (x[i] - mean) * scale
+else:
+    _normalize_kernel = None
 
 
 class GPRDataProcessor:
@@ -323,11 +636,12 @@ class GPRDataProcessor:
         Returns:
             GPR data array
         """
-        with h5py.File(output_file, 'r') as f:
+        with h5py.File(output_file, 'r', **HDF5_READ_OPTIONS) as f:
             # Adjust according to gprMax output structure
             rxs = f['rxs']
             rx_component = rxs['rx1']['Ez']  # E field z component
-            data = np.array(rx_component)
+            data = np.empty(rx_component.shape, dtype=np.float32)
+            rx_component.read_direct(data)
 
         return data
 
@@ -342,13 +656,22 @@ class GPRDataProcessor:
         Returns:
             Normalized data
         """
-        mean = np.mean(data)
-        std = np.std(data)
+        if _normalize_kernel is not None and data.size >= NUMBA_NORMALIZE_MIN_SIZE:
+            out = np.empty(data.shape, dtype=np.result_type(data, 1.0))
+            _normalize_kernel(np.ascontiguousarray(data).reshape(-1), out.reshape(-1))
+            return out
+
+        # Accumulate the mean in float64 but keep the result in the input dtype
+        mean = float(data.mean(dtype=np.float64))
+
+        # Center once, then reuse that buffer for the variance and the scaling
+        centered = data - mean
+        flat = centered.reshape(-1)
+        std = float(np.sqrt(np.dot(flat, flat) / flat.size)) if flat.size else 0.0
 
         if std > 0:
-            return (data - mean) / std
-        else:
-            return data - mean
+            centered /= std
+        return centered
 
 
 def main():
@@ -376,7 +699,9 @@ def main():
     # Generate dataset (from config)
     metadata = simulator.generate_time_series_dataset(
         num_sequences=config['generation']['num_sequences'],
-        stages_per_sequence=config['generation']['stages_per_sequence']
+        stages_per_sequence=config['generation']['stages_per_sequence'],
+        num_workers=config['generation'].get('num_workers'),
+        metadata_format=config['generation'].get('metadata_format', 'yaml')
     )
 
     print("\nSimulation input files generated successfully!")
@@ -3,7 +3,13 @@ gprMax execution wrapper: Run gprMax directly from Python
 """
 import os
 import sys
+import asyncio
+import shutil
 import subprocess
+import importlib.util
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import List, Optional
 import multiprocessing as mp
@@ -11,15 +17,195 @@ from tqdm import tqdm
 import yaml
 
 
+def repack_output(output_file: str, metadata_block_size: int = 32 * 1024 * 1024) -> bool:
+    """
+    Repack a gprMax output file with a larger HDF5 metadata block size
+
+    Aggregating metadata into larger blocks speeds up later reads of the file.
+
+    Args:
+        output_file: Output file path (.out)
+        metadata_block_size: Metadata block size in bytes
+
+    Returns:
+        Whether successful or not
+    """
+    if shutil.which('h5repack') is None:
+        print("Warning: h5repack not found, skipping repack")
+        return False
+
+    output_path = Path(output_file)
+    repacked_path = output_path.with_suffix('.repack.out')
+
+    try:
+        subprocess.run(
+            ["h5repack", "-M", str(metadata_block_size), str(output_path), str(repacked_path)],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        os.replace(repacked_path, output_path)
+        return True
+
+    except subprocess.CalledProcessError as e:
+        print(f"Error repacking {output_file}:")
+        print(e.stderr)
+        repacked_path.unlink(missing_ok=True)
+        return False
+
+
+def _tail(path: Path, num_bytes: int = 8192) -> str:
+    """Return the last num_bytes of a text file"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - num_bytes, 0))
+        return f.read().decode(errors='replace')
+
+
+def _visible_device(gpu: int) -> str:
+    """
+    CUDA_VISIBLE_DEVICES entry for a GPU index
+
+    GPU indices count the devices this process can see, so they are mapped
+    through an inherited CUDA_VISIBLE_DEVICES (e.g. one set by a job scheduler).
+    """
+    visible = os.environ.get('CUDA_VISIBLE_DEVICES')
+    if visible:
+        return visible.split(',')[gpu].strip()
+    return str(gpu)
+
+
+def _gpu_env(gpu: Optional[int]) -> Optional[dict]:
+    """Environment that pins a gprMax subprocess to one GPU (inherit if None)"""
+    if gpu is None:
+        return None
+    return {**os.environ, 'CUDA_VISIBLE_DEVICES': _visible_device(gpu)}
+
+
+def _pin_gpu(gpu: Optional[int]) -> None:
+    """Worker process initializer: make only the given GPU visible"""
+    if gpu is not None:
+        os.environ['CUDA_VISIBLE_DEVICES'] = _visible_device(gpu)
+
+
+def _run_in_process(
+    input_file: str,
+    output_dir: Optional[str] = None,
+    gpu: Optional[int] = None,
+    geometry_only: bool = False
+) -> bool:
+    """
+    Run a single gprMax simulation through its Python API in this process
+
+    gprMax is imported once per worker process, so the interpreter startup is
+    paid per worker instead of per simulation.
+
+    Args:
+        input_file: Input file path (.in)
+        output_dir: Output directory
+        gpu: GPU ID (CPU if None)
+        geometry_only: Generate geometry only
+
+    Returns:
+        Whether successful or not
+    """
+    from gprMax.gprMax import api as gprmax_api
+
+    input_path = Path(input_file)
+    if not input_path.exists():
+        print(f"Error: Input file not found: {input_file}")
+        return False
+
+    log_file = GPRMaxRunner._log_file(input_path, output_dir)
+
+    try:
+        with open(log_file, 'w') as log, redirect_stdout(log), redirect_stderr(log):
+            gprmax_api(
+                str(input_path),
+                gpu=[gpu] if gpu is not None else None,
+                geometry_only=geometry_only
+            )
+
+    except (Exception, SystemExit) as e:
+        print(f"Error running gprMax for {input_file}: {e} (see {log_file}):")
+        print(_tail(log_file))
+        return False
+
+    # gprMax writes the output next to the input file
+    if output_dir and not geometry_only:
+        output_file = input_path.with_suffix('.out')
+        if output_file.exists():
+            shutil.move(str(output_file), str(Path(output_dir) / output_file.name))
+
+    return GPRMaxRunner._check_output(input_path, output_dir, geometry_only)
+
+
 class GPRMaxRunner:
     """gprMax execution class"""
 
-    def __init__(self, num_workers: int = None):
+    def __init__(self, num_workers: int = None, in_process: bool = False, workers_per_gpu: int = 1):
         """
         Args:
             num_workers: Number of parallel workers (defaults to CPU count if None)
+            in_process: Call the gprMax Python API inside worker processes
+                instead of launching one gprMax subprocess per simulation
+            workers_per_gpu: Concurrent simulations per GPU when running on GPU
         """
         self.num_workers = num_workers or mp.cpu_count()
+        self.in_process = in_process
+        self.workers_per_gpu = workers_per_gpu
+
+    def _build_command(
+        self,
+        input_path: Path,
+        output_dir: Optional[str] = None,
+        gpu: Optional[int] = None,
+        geometry_only: bool = False
+    ) -> List[str]:
+        """Build the gprMax command line"""
+        cmd = ["python", "-m", "gprMax", str(input_path)]
+
+        if output_dir:
+            cmd.extend(["-outputdir", output_dir])
+
+        # gprMax -gpu option: simply add "-gpu" flag
+        # Note: gprMax uses the first visible GPU, so the device is pinned via CUDA_VISIBLE_DEVICES
+        if gpu is not None:
+            cmd.append("-gpu")
+
+        if geometry_only:
+            cmd.append("-geometry-only")
+
+        return cmd
+
+    @staticmethod
+    def _log_file(input_path: Path, output_dir: Optional[str] = None) -> Path:
+        """Log file that gprMax output is streamed to, next to the results"""
+        log_file = input_path.with_suffix('.log')
+        if output_dir:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            log_file = Path(output_dir) / log_file.name
+        return log_file
+
+    @staticmethod
+    def _check_output(
+        input_path: Path,
+        output_dir: Optional[str] = None,
+        geometry_only: bool = False
+    ) -> bool:
+        """Check that gprMax created the output file"""
+        if geometry_only:
+            return True
+
+        output_file = input_path.with_suffix('.out')
+        if output_dir:
+            output_file = Path(output_dir) / output_file.name
+
+        if output_file.exists():
+            return True
+        else:
+            print(f"Warning: Output file not created: {output_file}")
+            return False
 
     def run_single(
         self,
@@ -45,56 +231,140 @@ class GPRMaxRunner:
             print(f"Error: Input file not found: {input_file}")
             return False
 
-        # Build gprMax command
-        cmd = ["python", "-m", "gprMax", str(input_path)]
-
-        if output_dir:
-            cmd.extend(["-outputdir", output_dir])
-
-        # gprMax -gpu option: simply add "-gpu" flag
-        # Note: gprMax automatically uses the first available GPU
-        if gpu is not None:
-            cmd.append("-gpu")
-
-        if geometry_only:
-            cmd.append("-geometry-only")
+        cmd = self._build_command(input_path, output_dir, gpu, geometry_only)
+        log_file = self._log_file(input_path, output_dir)
 
         try:
             # Execute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            # Check output file
-            if not geometry_only:
-                output_file = input_path.with_suffix('.out')
-                if output_dir:
-                    output_file = Path(output_dir) / output_file.name
+            with open(log_file, 'wb') as log:
+                subprocess.run(
+                    cmd,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    env=_gpu_env(gpu),
+                    check=True
+                )
+
+            return self._check_output(input_path, output_dir, geometry_only)
+
+        except subprocess.CalledProcessError:
+            print(f"Error running gprMax for {input_file} (see {log_file}):")
+            print(_tail(log_file))
+            return False
 
-                if output_file.exists():
-                    return True
-                else:
-                    print(f"Warning: Output file not created: {output_file}")
-                    return False
-            else:
-                return True
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return False
 
-        except subprocess.CalledProcessError as e:
-            print(f"Error running gprMax for {input_file}:")
-            print(e.stderr)
+    async def _run_single_async(
+        self,
+        input_file: str,
+        output_dir: Optional[str] = None,
+        gpu: Optional[int] = None
+    ) -> bool:
+        """Run a single gprMax simulation as an asyncio subprocess"""
+        input_path = Path(input_file)
+        if not input_path.exists():
+            print(f"Error: Input file not found: {input_file}")
             return False
 
+        cmd = self._build_command(input_path, output_dir, gpu)
+        log_file = self._log_file(input_path, output_dir)
+
+        try:
+            with open(log_file, 'wb') as log:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=log,
+                    stderr=asyncio.subprocess.STDOUT,
+                    env=_gpu_env(gpu)
+                )
+                returncode = await process.wait()
+
         except Exception as e:
             print(f"Unexpected error: {e}")
             return False
 
-    def _run_worker(self, args):
-        """Worker for parallel execution"""
-        input_file, output_dir, gpu = args
-        return self.run_single(input_file, output_dir, gpu)
+        if returncode != 0:
+            print(f"Error running gprMax for {input_file} (see {log_file}):")
+            print(_tail(log_file))
+            return False
+
+        return self._check_output(input_path, output_dir)
+
+    async def _run_all(
+        self,
+        input_files: List[str],
+        output_dir: Optional[str],
+        slots: List[Optional[int]],
+        in_process: bool
+    ) -> List[bool]:
+        """
+        Run all simulations on a fixed set of worker slots
+
+        Each slot runs one simulation at a time and pulls the next input from a
+        shared queue as soon as it is free, so slow simulations never hold up
+        idle GPUs/workers.
+
+        Args:
+            input_files: List of input files
+            output_dir: Output directory
+            slots: GPU ID for each worker slot (None for CPU)
+            in_process: Run gprMax through its Python API in one worker process per slot
+
+        Returns:
+            Success flag for each input file
+        """
+        queue = asyncio.Queue()
+        for index, input_file in enumerate(input_files):
+            queue.put_nowait((index, input_file))
+
+        results = [False] * len(input_files)
+        loop = asyncio.get_running_loop()
+
+        with tqdm(total=len(input_files), desc="Running gprMax") as progress:
+            def new_executor(gpu):
+                # Spawned (not forked) so CUDA is initialised fresh, on the pinned GPU
+                return ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=mp.get_context('spawn'),
+                    initializer=_pin_gpu,
+                    initargs=(gpu,)
+                )
+
+            async def worker(gpu):
+                executor = new_executor(gpu) if in_process else None
+
+                try:
+                    while not queue.empty():
+                        index, input_file = queue.get_nowait()
+                        if executor is not None:
+                            try:
+                                # The pinned GPU is the only visible device, i.e. device 0
+                                results[index] = await loop.run_in_executor(
+                                    executor,
+                                    _run_in_process,
+                                    input_file,
+                                    output_dir,
+                                    None if gpu is None else 0
+                                )
+                            except (BrokenProcessPool, Exception) as e:
+                                # Worker died (e.g. OOM kill or crash in gprMax): fail this
+                                # file and continue the slot on a fresh worker process
+                                print(f"Error running gprMax for {input_file}: worker failed ({e!r})")
+                                results[index] = False
+                                executor.shutdown(wait=False)
+                                executor = new_executor(gpu)
+                        else:
+                            results[index] = await self._run_single_async(input_file, output_dir, gpu)
+                        progress.update(1)
+                finally:
+                    if executor is not None:
+                        executor.shutdown()
+
+            await asyncio.gather(*(worker(gpu) for gpu in slots))
+
+        return results
 
     def run_batch(
         self,
@@ -113,8 +383,6 @@ class GPRMaxRunner:
         Returns:
             Execution result statistics
         """
-        print(f"Running {len(input_files)} simulations with {self.num_workers} workers...")
-
         # Get GPU count (using pycuda)
         num_gpus = 0
         if use_gpu:
@@ -134,38 +402,29 @@ class GPRMaxRunner:
                 print(f"Warning: GPU detection failed: {e}, falling back to CPU")
                 use_gpu = False
 
-        # Prepare arguments for parallel execution
-        tasks = []
-        for i, input_file in enumerate(input_files):
-            # Assign GPU ID when using GPU (rotate if multiple GPUs available)
-            gpu = (i % num_gpus) if (use_gpu and num_gpus > 0) else None
-            tasks.append((input_file, output_dir, gpu))
+        # Worker slots: workers_per_gpu per GPU when using GPU, otherwise num_workers CPU slots
+        if use_gpu and num_gpus > 0:
+            slots = [gpu for gpu in range(num_gpus) for _ in range(self.workers_per_gpu)]
+        else:
+            slots = [None] * self.num_workers
+
+        print(f"Running {len(input_files)} simulations with {len(slots)} workers...")
+
+        in_process = self.in_process
+        if in_process and importlib.util.find_spec('gprMax') is None:
+            print("Warning: gprMax not importable, falling back to subprocesses")
+            in_process = False
+
+        # One asyncio event loop feeds the worker slots
+        results = asyncio.run(self._run_all(input_files, output_dir, slots, in_process))
 
-        # Parallel execution
         success_count = 0
         failed_files = []
-
-        if self.num_workers > 1:
-            with mp.Pool(self.num_workers) as pool:
-                results = list(tqdm(
-                    pool.imap(self._run_worker, tasks),
-                    total=len(tasks),
-                    desc="Running gprMax"
-                ))
-
-                for input_file, success in zip(input_files, results):
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_files.append(input_file)
-        else:
-            # Single-threaded execution
-            for input_file, output_dir, gpu in tqdm(tasks, desc="Running gprMax"):
-                success = self.run_single(input_file, output_dir, gpu)
-                if success:
-                    success_count += 1
-                else:
-                    failed_files.append(input_file)
+        for input_file, success in zip(input_files, results):
+            if success:
+                success_count += 1
+            else:
+                failed_files.append(input_file)
 
         # Result summary
         stats = {
@@ -211,6 +470,22 @@ def main():
         default='*.in',
         help='File pattern to match (default: *.in)'
     )
+    parser.add_argument(
+        '--workers-per-gpu',
+        type=int,
+        default=1,
+        help='Concurrent simulations per GPU with --gpu (default: 1)'
+    )
+    parser.add_argument(
+        '--in-process',
+        action='store_true',
+        help='Run gprMax through its Python API in worker processes instead of one subprocess per simulation'
+    )
+    parser.add_argument(
+        '--repack',
+        action='store_true',
+        help='Repack .out files with a 32 MiB HDF5 metadata block size (requires h5repack)'
+    )
 
     args = parser.parse_args()
 
@@ -230,13 +505,28 @@ def main():
     print(f"Found {len(input_files)} input files")
 
     # Run gprMax
-    runner = GPRMaxRunner(num_workers=args.workers)
+    runner = GPRMaxRunner(
+        num_workers=args.workers,
+        in_process=args.in_process,
+        workers_per_gpu=args.workers_per_gpu
+    )
     stats = runner.run_batch(
         input_files,
         output_dir=args.output_dir,
         use_gpu=args.gpu
     )
 
+    # Optionally repack outputs for faster reads during export/visualization
+    if args.repack:
+        failed = set(stats['failed_files'])
+        for input_file in input_files:
+            if input_file in failed:
+                continue
+            output_file = Path(input_file).with_suffix('.out')
+            if args.output_dir:
+                output_file = Path(args.output_dir) / output_file.name
+            repack_output(str(output_file))
+
     # Display results
     print("\n" + "="*50)
     print("SIMULATION RESULTS")
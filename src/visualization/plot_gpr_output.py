@@ -1,28 +1,74 @@
 """
 Visualization of gprMax output files (.out)
 """
+import os
 import sys
 import argparse
+import functools
 from pathlib import Path
 import h5py
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import cm
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# HDF5 open options for reading .out files: the in-memory core driver reads the
+# (small) file once, plus latest file format features and a large chunk cache
+HDF5_READ_OPTIONS = {
+    'driver': 'core',
+    'backing_store': False,
+    'libver': 'latest',
+    'rdcc_nbytes': 64 * 1024 * 1024,
+    'rdcc_nslots': 1_000_003,
+    'rdcc_w0': 0.75
+}
+
+# Number of loaded .out files kept in memory for repeated plots
+LOAD_CACHE_SIZE = 32
+
+
+def _read_dataset(dset: h5py.Dataset, dtype=np.float32) -> np.ndarray:
+    """
+    Read a whole dataset into a new preallocated array with read_direct
+
+    Args:
+        dset: HDF5 dataset
+        dtype: Output dtype (values are converted on read)
+
+    Returns:
+        Dataset values
+    """
+    arr = np.empty(dset.shape, dtype=dtype)
+    if arr.size:
+        dset.read_direct(arr)
+    return arr
 
 
 def load_gpr_output(output_file: str) -> dict:
     """
     Load gprMax output file
 
+    Field components are returned as float32. Results are cached on
+    (path, modification time); the returned arrays are shared between calls
+    and read-only.
+
     Args:
         output_file: Path to .out file
 
     Returns:
         Data dictionary
     """
+    return _load_gpr_output(str(output_file), os.path.getmtime(output_file))
+
+
+@functools.lru_cache(maxsize=LOAD_CACHE_SIZE)
+def _load_gpr_output(output_file: str, mtime: float) -> dict:
+    """Load gprMax output file (cached; mtime invalidates stale entries)"""
     data = {}
 
-    with h5py.File(output_file, 'r') as f:
+    with h5py.File(output_file, 'r', **HDF5_READ_OPTIONS) as f:
         # Get receiver data
         rxs = f['rxs']
 
@@ -34,7 +80,8 @@ def load_gpr_output(output_file: str) -> dict:
             # Load each component
             for component in ['Ex', 'Ey', 'Ez', 'Hx', 'Hy', 'Hz']:
                 if component in rx:
-                    rx_data[component] = np.array(rx[component])
+                    rx_data[component] = _read_dataset(rx[component])
+                    rx_data[component].flags.writeable = False
 
             data[rx_name] = rx_data
 
@@ -47,8 +94,91 @@ def load_gpr_output(output_file: str) -> dict:
     return data
 
 
+def load_component(output_file: str, component: str, rx_name: str = None) -> dict:
+    """
+    Load a single field component for one or all receivers
+
+    Traces are read directly into the rows of one preallocated float32
+    (n_receivers, n_samples) array, skipping every other component in the file.
+    Results are cached on (path, modification time); the returned traces are
+    shared between calls and read-only.
+
+    Args:
+        output_file: Path to .out file
+        component: Electric/magnetic field component
+        rx_name: Receiver name (all receivers if None)
+
+    Returns:
+        Data dictionary with 'traces', 'rx_names', 'missing' and time metadata
+    """
+    return _load_component(str(output_file), component, rx_name, os.path.getmtime(output_file))
+
+
+@functools.lru_cache(maxsize=LOAD_CACHE_SIZE)
+def _load_component(output_file: str, component: str, rx_name: str, mtime: float) -> dict:
+    """Load a single field component (cached; mtime invalidates stale entries)"""
+    data = {'traces': None, 'rx_names': [], 'missing': []}
+
+    with h5py.File(output_file, 'r', **HDF5_READ_OPTIONS) as f:
+        rxs = f['rxs']
+        available = [k for k in rxs.keys() if k.startswith('rx')]
+        rx_names = [rx_name] if rx_name is not None else sorted(available)
+
+        datasets = []
+        for name in rx_names:
+            if name in available and component in rxs[name]:
+                datasets.append(rxs[name][component])
+                data['rx_names'].append(name)
+            else:
+                data['missing'].append(name)
+
+        if datasets:
+            traces = np.empty((len(datasets), datasets[0].shape[0]), dtype=np.float32)
+            for i, dset in enumerate(datasets):
+                dset.read_direct(traces, np.s_[:], np.s_[i, :])
+            traces.flags.writeable = False
+            data['traces'] = traces
+
+        # Metadata
+        if 'dt' in f.attrs:
+            data['dt'] = f.attrs['dt']
+        if 'iterations' in f.attrs:
+            data['iterations'] = f.attrs['iterations']
+
+    return data
+
+
+# Off-screen figures reused across saved plots, keyed by figure size
+_FIGURE_CACHE = {}
+
+
+def _get_figure(figsize: tuple, reuse: bool) -> Figure:
+    """
+    Get an empty figure to plot into
+
+    Args:
+        figsize: Figure size (inches)
+        reuse: Reuse a cleared off-screen (Agg) figure instead of creating a pyplot figure
+
+    Returns:
+        Figure
+    """
+    if not reuse:
+        return plt.figure(figsize=figsize)
+
+    fig = _FIGURE_CACHE.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _FIGURE_CACHE[figsize] = fig
+    else:
+        fig.clf()
+
+    return fig
+
+
 def plot_ascan(data: dict, rx_name: str = 'rx1', component: str = 'Ez',
-               output_file: str = None, title: str = None):
+               output_file: str = None, title: str = None, dpi: int = 300):
     """
     A-scan plot (single trace)
 
@@ -58,6 +188,7 @@ def plot_ascan(data: dict, rx_name: str = 'rx1', component: str = 'Ez',
         component: Electric/magnetic field component
         output_file: Output filename
         title: Plot title
+        dpi: Output image resolution
     """
     if rx_name not in data:
         print(f"Error: Receiver {rx_name} not found")
@@ -83,26 +214,26 @@ def plot_ascan(data: dict, rx_name: str = 'rx1', component: str = 'Ez',
         xlabel = 'Sample'
 
     # Plot
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = _get_figure((12, 6), reuse=output_file is not None)
+    ax = fig.subplots()
     ax.plot(time, signal, linewidth=0.8)
     ax.set_xlabel(xlabel, fontsize=12)
     ax.set_ylabel(f'{component} Field (V/m or A/m)', fontsize=12)
     ax.set_title(title or f'A-scan: {rx_name} - {component}', fontsize=14)
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        fig.savefig(output_file, dpi=dpi)
         print(f"Saved to {output_file}")
     else:
         plt.show()
-
-    plt.close()
+        plt.close(fig)
 
 
 def plot_bscan(output_file_path: str, component: str = 'Ez',
-               output_file: str = None, title: str = None):
+               output_file: str = None, title: str = None, dpi: int = 300):
     """
     B-scan plot (multiple traces from a single .out file)
 
@@ -111,30 +242,23 @@ def plot_bscan(output_file_path: str, component: str = 'Ez',
         component: Electric/magnetic field component
         output_file: Output filename
         title: Plot title
+        dpi: Output image resolution
     """
-    data = load_gpr_output(output_file_path)
+    # B-scan data (traces x time_samples), one row per receiver (rx1, rx2, rx3, ...)
+    data = load_component(output_file_path, component)
 
-    # Get all receiver names (rx1, rx2, rx3, ...)
-    rx_names = sorted([k for k in data.keys() if k.startswith('rx')])
-
-    if not rx_names:
+    if not data['rx_names'] and not data['missing']:
         print("Error: No receiver data found")
         return
 
-    traces = []
-    for rx_name in rx_names:
-        if component in data[rx_name]:
-            traces.append(data[rx_name][component])
-        else:
-            print(f"Warning: Component {component} not found in {rx_name}")
+    for rx_name in data['missing']:
+        print(f"Warning: Component {component} not found in {rx_name}")
 
-    if not traces:
+    bscan = data['traces']
+    if bscan is None:
         print(f"Error: No data found for component {component}")
         return
 
-    # Create B-scan data (traces x time_samples)
-    bscan = np.array(traces)
-
     # Get time information
     if 'dt' in data and 'iterations' in data:
         dt = data['dt']
@@ -145,40 +269,40 @@ def plot_bscan(output_file_path: str, component: str = 'Ez',
         time_label = 'Time Sample'
 
     # Plot
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig = _get_figure((14, 8), reuse=output_file is not None)
+    ax = fig.subplots()
 
-    # Colormap with proper extent
+    # Colormap with proper extent (nearest: no resampling filter over large B-scans)
     im = ax.imshow(
         bscan.T,
         aspect='auto',
         cmap='seismic',
-        interpolation='bilinear',
-        extent=[0, len(traces), time[-1], time[0]]
+        interpolation='nearest',
+        extent=[0, len(bscan), time[-1], time[0]]
     )
 
     ax.set_xlabel('Trace Number', fontsize=12)
     ax.set_ylabel(time_label, fontsize=12)
-    ax.set_title(title or f'B-scan: {component} ({len(traces)} traces)', fontsize=14)
+    ax.set_title(title or f'B-scan: {component} ({len(bscan)} traces)', fontsize=14)
 
-    cbar = plt.colorbar(im, ax=ax)
+    cbar = fig.colorbar(im, ax=ax)
     cbar.set_label(f'{component} Field Amplitude', fontsize=11)
 
     # Add grid
     ax.grid(True, alpha=0.3, linestyle='--')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        fig.savefig(output_file, dpi=dpi)
         print(f"Saved to {output_file}")
     else:
         plt.show()
-
-    plt.close()
+        plt.close(fig)
 
 
 def plot_all_components(output_file: str, rx_name: str = 'rx1',
-                        save_dir: str = None):
+                        save_dir: str = None, dpi: int = 300):
     """
     Plot all components at once
 
@@ -186,6 +310,7 @@ def plot_all_components(output_file: str, rx_name: str = 'rx1',
         output_file: .out file path
         rx_name: Receiver name
         save_dir: Save directory
+        dpi: Output image resolution
     """
     data = load_gpr_output(output_file)
 
@@ -212,7 +337,8 @@ def plot_all_components(output_file: str, rx_name: str = 'rx1',
 
     # Subplots
     n_components = len(components)
-    fig, axes = plt.subplots(n_components, 1, figsize=(12, 3*n_components))
+    fig = _get_figure((12, 3*n_components), reuse=save_dir is not None)
+    axes = fig.subplots(n_components, 1)
 
     if n_components == 1:
         axes = [axes]
@@ -229,17 +355,16 @@ def plot_all_components(output_file: str, rx_name: str = 'rx1',
 
     base_name = Path(output_file).stem
     fig.suptitle(f'GPR Output: {base_name}', fontsize=14, y=0.995)
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_dir:
         save_path = Path(save_dir) / f'{base_name}_all_components.png'
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.savefig(save_path, dpi=dpi)
         print(f"Saved to {save_path}")
     else:
         plt.show()
-
-    plt.close()
+        plt.close(fig)
 
 
 def main():
@@ -280,6 +405,12 @@ def main():
         type=str,
         help='Plot title'
     )
+    parser.add_argument(
+        '--dpi',
+        type=int,
+        default=300,
+        help='Output image resolution (default: 300; e.g. 150 for quick-look plots)'
+    )
 
     args = parser.parse_args()
 
@@ -298,7 +429,8 @@ def main():
                 rx_name=args.rx,
                 component=args.component,
                 output_file=args.output,
-                title=args.title
+                title=args.title,
+                dpi=args.dpi
             )
         else:
             print("Error: A-scan mode requires a single .out file")
@@ -311,7 +443,8 @@ def main():
                 str(input_path),
                 component=args.component,
                 output_file=args.output,
-                title=args.title
+                title=args.title,
+                dpi=args.dpi
             )
         elif input_path.is_dir():
             # Directory mode: process all .out files
@@ -333,7 +466,8 @@ def main():
                     str(out_file),
                     component=args.component,
                     output_file=str(output_filename),
-                    title=f"{out_file.stem} - {args.component}"
+                    title=f"{out_file.stem} - {args.component}",
+                    dpi=args.dpi
                 )
 
             print(f"\nAll plots saved to {output_dir}")
@@ -347,7 +481,8 @@ def main():
             plot_all_components(
                 str(input_path),
                 rx_name=args.rx,
-                save_dir=save_dir
+                save_dir=save_dir,
+                dpi=args.dpi
             )
         else:
             print("Error: 'all' mode requires a single .out file")